@@ -40,7 +40,10 @@ def pomodoro():
                 # displaying time
                 timeout=DISPLAY 
                     )
-            time.sleep(lapse.duration)
+            # espera por plazos cortos en lugar de un solo sleep largo
+            deadline = time.monotonic() + lapse.duration
+            while (remaining := deadline - time.monotonic()) > 0:
+                time.sleep(min(remaining, 1.0))
             
             
 if __name__ == '__main__':
@@ -5,52 +5,112 @@ task.csv
 """
 
 from docxtpl import DocxTemplate, RichText
+from jinja2 import Environment
+from collections import OrderedDict, namedtuple
 from datetime import datetime
+from functools import lru_cache
 from pathlib import Path
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Tuple, Union
+import copy
 import csv
-import yaml
+import io
+import os
 import logging
 
+from storage import CSV_BUFFER, read_json_cache, write_json_cache, yaml_codec
+
 # Configurar logging al inicio
 logging.basicConfig(level=logging.INFO, format='%(levelname)s: %(message)s')
 
 # Constantes
 FIELDS = ("uri", "owner", "title", "description", "status")
-FOLDER = "tasks"
+TaskRow = namedtuple("TaskRow", FIELDS)
+FOLDER = Path("tasks")
+OUTPUT_FOLDER = Path("reports")
 DATE_NOW = datetime.today().strftime("%d/%m/%Y")
+JINJA_ENV = Environment()  # compartido por todos los render
+YAML_CACHE_SIZE = 100
+
+# ruta -> ((mtime, size), actividades)
+_yaml_cache: OrderedDict = OrderedDict()
+
+class _SafeChars(dict):
+    """Tabla para str.translate: conserva alfanuméricos, espacio, '-' y '_'"""
+    def __missing__(self, code: int):
+        char = chr(code)
+        self[code] = code if char.isalnum() or char in ' -_' else None
+        return self[code]
 
-def load_yaml(yaml_path: str) -> List[Dict[str, Any]]:
-    """Carga actividades desde archivo YAML"""
+_SAFE = _SafeChars()
+_DATE_FMT: Dict[str, str] = {}  # fecha ISO -> dd/mm/YYYY
+
+@lru_cache(maxsize=None)
+def get_template(template_path: Union[str, Path]) -> DocxTemplate:
+    """Cachea en memoria los bytes de la plantilla (docxtpl igual vuelve a parsear el Document en cada render)"""
+    return DocxTemplate(io.BytesIO(Path(template_path).read_bytes()))
+
+@lru_cache(maxsize=None)
+def get_output_path(output_folder: Union[str, Path]) -> Path:
+    """Normaliza la carpeta de salida y la crea una sola vez"""
+    output_path = Path(output_folder)
+    output_path.mkdir(parents=True, exist_ok=True)
+    return output_path
+
+def load_yaml(yaml_path: Union[str, Path]) -> List[Dict[str, Any]]:
+    """Carga actividades desde archivo YAML (cache por mtime y tamaño)"""
     try:
-        with open(yaml_path, 'r', encoding='utf-8') as f:
-            data = yaml.safe_load(f)
-            logging.info(f"Cargadas {len(data)} actividades desde YAML")
-            return data
+        st = os.stat(yaml_path)
+        key = (st.st_mtime, st.st_size)
+        cached = _yaml_cache.get(yaml_path)
+        if cached and cached[0] == key:
+            _yaml_cache.move_to_end(yaml_path)
+            return copy.deepcopy(cached[1])
+
+        data = read_json_cache(yaml_path)
+        if data is None:
+            yaml, loader, _ = yaml_codec()
+            with open(yaml_path, 'r', encoding='utf-8') as f:
+                data = yaml.load(f, Loader=loader)
+            write_json_cache(yaml_path, data)
+        logging.info(f"Cargadas {len(data)} actividades desde YAML")
+
+        _yaml_cache[yaml_path] = (key, data)
+        if len(_yaml_cache) > YAML_CACHE_SIZE:
+            _yaml_cache.popitem(last=False)
+        return copy.deepcopy(data)
     except Exception as e:
         logging.error(f"Error cargando YAML: {e}")
         return []
 
-def load_csv(folder_path: str = FOLDER) -> List[Dict[str, Any]]:
+def load_csv(folder_path: Union[str, Path] = FOLDER) -> List[TaskRow]:
     """Carga tareas desde CSV"""
     file_path = Path(folder_path) / "tasks.csv"
-    tasks_list: List[Dict[str, Any]] = []
+    tasks_list: List[TaskRow] = []
     
     if not file_path.exists():
         logging.info("No se encontró CSV existente. Iniciando desde cero.")
         return tasks_list
     
     try:
-        with open(file_path, 'r', encoding='utf-8', newline='') as f:
-            reader = csv.DictReader(f)
+        with open(file_path, 'r', encoding='utf-8', newline='', buffering=CSV_BUFFER) as f:
+            reader = csv.reader(f)
+            header = next(reader, [])
+            # el encabezado se valida una sola vez, no en cada fila
+            missing = [f for f in FIELDS if f not in header]
+            if missing:
+                logging.error(f"CSV sin las columnas {missing}")
+                return tasks_list
+            idx = [header.index(field) for field in FIELDS]
+            width = max(idx) + 1
             for row_num, row in enumerate(reader, start=2):
-                if not all(field in row for field in FIELDS):
-                    missing = [f for f in FIELDS if f not in row]
+                if not row:
+                    continue
+                if len(row) < width:
+                    missing = [f for f, i in zip(FIELDS, idx) if i >= len(row)]
                     logging.warning(f"Fila {row_num}: Campos faltantes {missing}")
                     continue
                 
-                task = {field: row[field] for field in FIELDS}
-                tasks_list.append(task)
+                tasks_list.append(TaskRow._make(row[i] for i in idx))
         
         logging.info(f"Cargadas {len(tasks_list)} tareas desde CSV")
         
@@ -73,31 +133,43 @@ def stats(data: List[Dict[str, Any]]):
         'last_update': end_date.strftime("%d/%m/%Y")
     }
 
-def generate_reports(task: Dict[str, Any], 
+def format_date(iso_date: str) -> str:
+    """Convierte una fecha ISO a dd/mm/YYYY, una sola vez por fecha"""
+    fecha = _DATE_FMT.get(iso_date)
+    if fecha is None:
+        fecha = _DATE_FMT[iso_date] = datetime.fromisoformat(iso_date).strftime("%d/%m/%Y")
+    return fecha
+
+@lru_cache(maxsize=128)
+def build_rich_text(items: Tuple[Tuple[str, str], ...]) -> RichText:
+    """Crea el RichText con las actividades (fecha, actividad)"""
+    lista_rt = RichText()
+    for idx, (date, activity) in enumerate(items, 1):
+        # Formato: "1. [2025-12-29] instalar git (linux/windows/mac)"
+        lista_rt.add(f"{idx}. [{format_date(date)}] {activity}\n", style='List Bullet')
+    return lista_rt
+
+def generate_reports(task: TaskRow, 
                      actividades: List[Dict[str, Any]],
                      stats_dict: Dict[str, Any],
-                     template_path: str = f"{FOLDER}/template.docx",
-                     output_folder: str = "reports"
+                     template_path: Union[str, Path] = FOLDER / "template.docx",
+                     output_folder: Union[str, Path] = OUTPUT_FOLDER
                      ):
     """Genera reportes de Word para cada tarea"""
     if not tasks:
         logging.info("No hay tareas para generar reportes")
         return
 
-    output_path = Path(output_folder)
-    output_path.mkdir(parents=True, exist_ok=True)
+    output_path = get_output_path(output_folder)
+
+    # RichText con la lista de actividades (memoizado por contenido)
+    lista_rt = build_rich_text(tuple((act['date'], act['activity']) for act in actividades))
 
-    lista_rt = RichText()  # Crear RichText con la lista de actividades
-    for idx, act in enumerate(actividades, 1):
-        # Formato: "1. [2025-12-29] instalar git (linux/windows/mac)"
-        fecha = datetime.fromisoformat(act['date']).strftime("%d/%m/%Y")
-        lista_rt.add(f"{idx}. [{fecha}] {act['activity']}\n", style='List Bullet')
-    
-    template = DocxTemplate(template_path)
-    
     try:
+        template = get_template(template_path)
+
         # Contexto combina task + lista de actividades
-        context = task.copy()
+        context = task._asdict()
         context['lista_actividades'] = lista_rt  # Para Opción 1 {{r lista_actividades}}
         context['actividades'] = actividades     # Para Opción 2 
         context['date_now'] = DATE_NOW
@@ -105,11 +177,11 @@ def generate_reports(task: Dict[str, Any],
         context['days_active'] = stats_dict['days_active']
         context['last_update'] = stats_dict['last_update']
         
-        template.render(context)
+        template.render(context, jinja_env=JINJA_ENV)
         
         # Generar nombre de archivo seguro
-        safe_owner = "".join(c for c in task['owner'] if c.isalnum() or c in (' ', '-', '_')).rstrip()
-        safe_title = "".join(c for c in task['title'] if c.isalnum() or c in (' ', '-', '_')).rstrip()
+        safe_owner = task.owner.translate(_SAFE).rstrip()
+        safe_title = task.title.translate(_SAFE).rstrip()
         filename = f"{safe_owner}_{safe_title}.docx"
 
         output_file = output_path / filename
@@ -120,9 +192,9 @@ def generate_reports(task: Dict[str, Any],
         logging.error(f"Error generando reporte: {e}")
 
 if __name__ == "__main__":
-    tasks = load_csv() # lista de diccionarios
+    tasks = load_csv() # lista de TaskRow
     for task in tasks:
-        uri, data = task['uri'], task
-        actividades = load_yaml(f"tasks/{uri}.yaml")
+        uri, data = task.uri, task
+        actividades = load_yaml(FOLDER / f"{uri}.yaml")
         stats_dict = stats(actividades)
         generate_reports(data, actividades, stats_dict)
\ No newline at end of file
@@ -5,94 +5,169 @@ heapq vs sorted vs algoritmo de ordenacion clasico
 creo que podria hacer el test dentro del mismo wrapper
 """
 from collections import namedtuple
+from dataclasses import dataclass
 from faker import Faker
+from operator import itemgetter
+import numpy as np
 import heapq
 import time
-import random
 import logging
 
+try:
+    from numba import njit
+    HAS_NUMBA = True
+except ImportError:  # sin numba el bucle corre en python (lento)
+    HAS_NUMBA = False
+    def njit(*args, **kwargs):
+        return lambda func: func
+
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 
 User = namedtuple("User", "CC name last_name phone_number email")
+INSERTION_CUTOFF = 16
+
+@dataclass
+class Users:
+    """Usuarios en columnas (SoA): CC es int64 contiguo, el resto object"""
+    CC: np.ndarray
+    name: np.ndarray
+    last_name: np.ndarray
+    phone_number: np.ndarray
+    email: np.ndarray
+
+    def __len__(self):
+        return len(self.CC)
+
+    def __getitem__(self, i):
+        return User(int(self.CC[i]), self.name[i], self.last_name[i],
+                    self.phone_number[i], self.email[i])
+
+    def take(self, order):
+        """Reordena todas las columnas con la misma permutacion"""
+        return Users(self.CC[order], self.name[order], self.last_name[order],
+                     self.phone_number[order], self.email[order])
 
 def generated_data(region, q=10000):
     logging.info(f"Generating {q} data records.")
-    data = []
+    # CC se genera de una sola vez como vector
+    CC = np.random.randint(1000000000, 1111999999 + 1, size=q, dtype=np.int64)
+    names = np.empty(q, dtype=object)
+    last_names = np.empty(q, dtype=object)
+    phones = np.empty(q, dtype=object)
+    emails = np.empty(q, dtype=object)
     fake = Faker(region)
-    for _ in range(q):
-        name = fake.first_name()
-        last_name = fake.last_name()
-        data.append(
-            User(
-                CC=random.randint(1000000000, 1111999999),
-                name=name,
-                last_name=last_name,
-                phone_number=fake.phone_number(),
-                email=f"{name[0]}.{last_name}@UTS.edu.co"
-            ))
+    fn, ln, pn = fake.first_name, fake.last_name, fake.phone_number
+    for i in range(q):
+        name = fn()
+        last_name = ln()
+        names[i] = name
+        last_names[i] = last_name
+        phones[i] = pn()
+        emails[i] = name[0] + "." + last_name + "@UTS.edu.co"
     logging.info("Data generation complete.")
-    return data
+    return Users(CC, names, last_names, phones, emails)
     
 def timing(func):
     def wrapper(*arg, **kw):
-        t1 = time.time()
+        t1 = time.perf_counter_ns()
         result = func(*arg, **kw)
-        t2 = time.time()
-        return (t2 - t1), result, func.__name__
+        dt_ms = (time.perf_counter_ns() - t1) / 1e6
+        return dt_ms, result, func.__name__
     return wrapper
 
 @timing
-def heapsort(iterable):
-    logging.info(f"Starting heapsort with {len(iterable)} items.")
-    h = []
-    for value in iterable:
-        heapq.heappush(h, value)
-        
-    return [heapq.heappop(h) for i in range(len(h))]
+def heapsort(data):
+    logging.info(f"Starting heapsort with {len(data)} items.")
+    # heapify arma el heap en O(n); el indice desempata y lo hace estable
+    h = list(zip(data.CC.tolist(), range(len(data))))
+    heapq.heapify(h)
+    return data.take([heapq.heappop(h)[1] for _ in range(len(h))])
+
+@njit(cache=True)
+def _bubble_ccs(cc, idx):
+    # ordena los indices comparando cc, compilado a codigo nativo con numba
+    n = len(idx)
+    for i in range(n):
+        for j in range(n - 1 - i):
+            if cc[idx[j]] > cc[idx[j + 1]]:
+                idx[j], idx[j + 1] = idx[j + 1], idx[j]
+    return idx
 
 @timing 
 def bubblesort(data):
     logging.info(f"Starting bubblesort with {len(data)} items.")
-    iterable = data.copy()
-    for i in range(len(iterable)):
-        for j in range(len(iterable) - 1):
-            if iterable[j].CC > iterable[j + 1].CC:
-                iterable[j], iterable[j + 1] = iterable[j + 1], iterable[j]
-
-    return iterable
+    if HAS_NUMBA:
+        order = _bubble_ccs(data.CC, np.arange(len(data), dtype=np.int64))
+    else:
+        # en python puro indexar listas es ~10x mas rapido que indexar arrays numpy
+        order = _bubble_ccs(data.CC.tolist(), list(range(len(data))))
+    return data.take(order)
 
 @timing
 def python_sort(data):
     logging.info(f"Starting python_sort with {len(data)} items.")
-    iterable = data.copy()
-    return sorted(iterable, key=lambda x: x.CC)
+    keys = data.CC.tolist()
+    return data.take(sorted(range(len(keys)), key=keys.__getitem__))
+
+@timing
+def numpy_sort(data):
+    logging.info(f"Starting numpy_sort with {len(data)} items.")
+    return data.take(np.argsort(data.CC, kind='stable'))
 
 @timing
 def quicksort(data):
     logging.info(f"Starting quicksort with {len(data)} items.")
-    iterable = data.copy()
-    _quicksort(iterable, 0, len(iterable) - 1)
-    return iterable
-
-def _quicksort(iterable, low, high):
-    if low < high:
-        pi = _partition(iterable, low, high)
-        _quicksort(iterable, low, pi - 1)
-        _quicksort(iterable, pi + 1, high)
-
-def _partition(iterable, low, high):
-    pivot = iterable[high].CC
-    i = low - 1
-    for j in range(low, high):
-        if iterable[j].CC <= pivot:
+    keys = data.CC.tolist()
+    order = list(range(len(keys)))
+    _quicksort(keys, order, 0, len(keys) - 1)
+    return data.take(order)
+
+def _quicksort(keys, order, low, high):
+    # recursa sobre la particion menor y continua el bucle con la mayor:
+    # la profundidad queda en O(log n) aunque las particiones salgan desbalanceadas
+    while high - low >= INSERTION_CUTOFF:
+        lt, gt = _partition(keys, order, low, high)
+        if lt - low < high - gt:
+            _quicksort(keys, order, low, lt - 1)
+            low = gt + 1
+        else:
+            _quicksort(keys, order, gt + 1, high)
+            high = lt - 1
+    # particiones pequeñas: insercion es mas rapida que seguir recursando
+    _insertion_sort(keys, order, low, high)
+
+def _insertion_sort(keys, order, low, high):
+    for i in range(low + 1, high + 1):
+        key, pos = keys[i], order[i]
+        j = i - 1
+        while j >= low and keys[j] > key:
+            keys[j + 1], order[j + 1] = keys[j], order[j]
+            j -= 1
+        keys[j + 1], order[j + 1] = key, pos
+
+def _partition(keys, order, low, high):
+    # mediana de tres: evita el O(n^2) con datos ya ordenados
+    a, b, c = keys[low], keys[(low + high) // 2], keys[high]
+    pivot = max(min(a, b), min(max(a, b), c))
+    # particion en tres (<, ==, >): las claves repetidas no se vuelven a ordenar
+    lt, i, gt = low, low, high
+    while i <= gt:
+        if keys[i] < pivot:
+            keys[lt], keys[i] = keys[i], keys[lt]
+            order[lt], order[i] = order[i], order[lt]
+            lt += 1
+            i += 1
+        elif keys[i] > pivot:
+            keys[gt], keys[i] = keys[i], keys[gt]
+            order[gt], order[i] = order[i], order[gt]
+            gt -= 1
+        else:
             i += 1
-            iterable[i], iterable[j] = iterable[j], iterable[i]
-    iterable[i + 1], iterable[high] = iterable[high], iterable[i + 1]
-    return i + 1
+    return lt, gt
 
 def test_sort(func_name, sorted_data, real_sorted_data):
     logging.info(f"Testing {func_name} result.")
-    if real_sorted_data == sorted_data:
+    if np.array_equal(sorted_data.CC, real_sorted_data):
         logging.info(f"{func_name} sorted the data correctly.")
     else:
         logging.error(f"{func_name} did not sort the data correctly.")
@@ -103,24 +178,24 @@ if __name__ == '__main__':
     times = []
     test = []
     data = generated_data(REGION)
-    canon = sorted(data, key=lambda x: x.CC)
+    canon = np.sort(data.CC)
 
     logging.info("Initial data (first 10 items):")
     for i, _ in enumerate(range(10)):
         print(f"pos {i +1}: {data[i].name} {data[i].last_name} {data[i].CC}")
 
-    func_list = [heapsort, bubblesort, python_sort, quicksort]
+    func_list = [heapsort, bubblesort, python_sort, numpy_sort, quicksort]
     logging.info("Starting sorting algorithms.")
     for f in func_list:
         times.append(f(data))
         
     logging.info("Sorting complete.")
-    times.sort(key=lambda x: x[0])
+    times.sort(key=itemgetter(0))
     logging.info("Printing results.")
 
     for (timed, result, func_name) in times:
         test_sort(func_name=func_name, sorted_data=result, real_sorted_data=canon)
 
     for (timed, result, func_name) in times:
-        print(f"{func_name} algorithm took --> {timed * 1000:.3f}ms.")
+        print(f"{func_name} algorithm took --> {timed:.3f}ms.")
     logging.info("Process finished.")
\ No newline at end of file
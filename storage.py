@@ -0,0 +1,46 @@
+"""
+Utilidades de persistencia compartidas por todo-list.py y report_docx.py
+(cache JSON junto a cada YAML, codec de pyyaml y buffer de lectura CSV)
+
+"""
+
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Union
+import json
+import logging
+import os
+
+CSV_BUFFER = 1 << 20  # 1 MiB de buffer de lectura
+
+@lru_cache(maxsize=None)
+def yaml_codec():
+    """Importa pyyaml solo cuando hace falta (yaml, Loader, Dumper)"""
+    import yaml
+    try:
+        from yaml import CSafeLoader as SafeLoader, CSafeDumper as SafeDumper
+    except ImportError:  # pyyaml compilado sin libyaml
+        from yaml import SafeLoader, SafeDumper
+    return yaml, SafeLoader, SafeDumper
+
+def read_json_cache(yaml_path: Union[str, Path]) -> Any:
+    """Lee <archivo>.json si no es más antiguo que el YAML"""
+    json_path = f"{yaml_path}.json"
+    try:
+        if os.path.getmtime(json_path) >= os.path.getmtime(yaml_path):
+            with open(json_path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+    except (OSError, ValueError):
+        pass
+    return None
+
+def write_json_cache(yaml_path: Union[str, Path], data: Any) -> None:
+    """Escribe <archivo>.json de forma atómica (temporal + rename)"""
+    tmp_path = f"{yaml_path}.json.tmp"
+    try:
+        text = json.dumps(data, ensure_ascii=False)
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            f.write(text)
+        os.replace(tmp_path, f"{yaml_path}.json")
+    except (OSError, TypeError, ValueError) as e:
+        logging.warning(f"Could not write JSON cache: {e}")
@@ -17,15 +17,16 @@ what was learned:
 """
 
 from collections import namedtuple, defaultdict
-from functools import wraps
+from functools import lru_cache, wraps
 from datetime import datetime
-from tabulate import tabulate
 import logging
 import os
+import atexit
 import csv
-import yaml
 import sys
 
+from storage import CSV_BUFFER, read_json_cache, write_json_cache, yaml_codec
+
 # Configurar logging
 logging.basicConfig(level=logging.INFO, format='%(levelname)s: %(message)s')
 
@@ -39,21 +40,52 @@ Entry = namedtuple("Entry", "date action activity")
 
 # Variables globales
 FOLDER = "tasks"
+CSV_REQUIRED = ("id", "owner", "title", "priority", "uri")
+# valores por defecto de las columnas opcionales del CSV
+CSV_DEFAULTS = {"description": "", "status": "IN PROGRESS", "created_at": "", "finished_at": ""}
+YAML_BUFFER = 1 << 16
+YAML_WIDTH = 10_000  # evita que yaml parta las entradas en varias líneas
+PRIORITY_MAP = {"1": "LOW", "2": "MEDIUM", "3": "HIGH"}
+FINISH_STATUSES = frozenset({"SUCCESS", "FAILED"})
+VIEW_FILTERS = frozenset({"ALL", "IN PROGRESS", "DONE", "SUCCESS", "FAILED"})
+URI_TRANS = str.maketrans({" ": "_", "/": "_", "\\": "_"})
 dict_tasks = {}
 history = defaultdict(list)
 next_id = 1000
+_dirty = set()  # tareas con cambios sin guardar
+_persisted = {}  # task_id -> (uri, entradas ya escritas, tamaño en bytes del YAML)
 
 # Utilidades
+_now = datetime.now
+
 def get_date():
-    return datetime.now().isoformat()
+    return _now().isoformat(timespec='seconds')
+
+def make_uri(owner, task_id):
+    """Nombre de archivo del historial: dueño sin espacios ni separadores + ID"""
+    return f"{owner.translate(URI_TRANS)}_{task_id}"
+
+def read_id(prompt):
+    """Lee un ID numérico; devuelve None si la entrada no es válida"""
+    value = input(prompt).strip()
+    if value.isdecimal():
+        return int(value)
+    logging.warning("Invalid input format.")
+    return None
 
 def find_task(task_id):
     """Busca una tarea por ID"""
-    task = dict_tasks.get(int(task_id))
-    if not task:
+    task = dict_tasks.get(task_id)
+    if not task and task_id is not None:
         logging.warning(f"Task with ID:{task_id} not found.")
     return task
 
+@lru_cache(maxsize=16)
+def render_table(rows):
+    """Tabla formateada; se reutiliza mientras las filas no cambien"""
+    from tabulate import tabulate
+    return tabulate(rows, headers='keys')
+
 # Decorador para tabular salida
 def tabulate_print(func):
     """Decorator to print data in tabulate format"""
@@ -66,12 +98,12 @@ def tabulate_print(func):
                 return data
             
             # Lista de diccionarios
-            if isinstance(data, list) and isinstance(data[0], dict):
+            if isinstance(data, (list, tuple)) and isinstance(data[0], dict):
+                from tabulate import tabulate
                 print(tabulate(data, headers='keys'))
-            # Lista de namedtuples (Task o Entry)
-            elif isinstance(data, list) and hasattr(data[0], '_asdict'):
-                dicts = [item._asdict() for item in data]
-                print(tabulate(dicts, headers='keys'))
+            # Lista de namedtuples (Task o Entry): tabulate usa _fields como encabezado
+            elif isinstance(data, (list, tuple)) and hasattr(data[0], '_asdict'):
+                print(render_table(tuple(data)))
             else:
                 print(data)
                 
@@ -83,7 +115,7 @@ def tabulate_print(func):
 
 # Persistencia CSV
 def load_csv():
-    """Carga tareas desde CSV"""
+    """Carga tareas desde CSV (None si faltan columnas obligatorias)"""
     global next_id
     file_path = os.path.join(FOLDER, "tasks.csv")
     tasks = {}
@@ -93,20 +125,38 @@ def load_csv():
         return tasks
     
     try:
-        with open(file_path, 'r', encoding='utf-8') as f:
-            reader = csv.DictReader(f)
+        with open(file_path, 'r', encoding='utf-8', newline='', buffering=CSV_BUFFER) as f:
+            reader = csv.reader(f)
+            header = next(reader, None) or []
+            missing = [f for f in CSV_REQUIRED if f not in header] if header else []
+            if missing:
+                logging.error(f"CSV is missing columns: {missing}")
+                return None
+            # columnas opcionales ausentes: se leen de un relleno al final de la fila
+            absent = [f for f in CSV_DEFAULTS if f not in header] if header else []
+            extra = [CSV_DEFAULTS[f] for f in absent]
+            columns = header + absent
+            # posiciones de las columnas en el orden de Task._fields
+            idx = [columns.index(field) for field in Task._fields] if header else []
+            n = len(header)
             for row in reader:
-                if row.get('id') and row.get('title'):
+                if not row:
+                    continue
+                # celdas vacías al final pueden faltar: se rellenan en lugar de perder la fila
+                row = row[:n] + [''] * (n - len(row)) + extra
+                (task_id, owner, title, description, priority,
+                 uri, status, created_at, finished_at) = (row[i] for i in idx)
+                if task_id and title:
                     task = Task(
-                        id=int(row['id']),
-                        owner=row['owner'].strip(),
-                        title=row['title'].strip(),
-                        description=row.get('description', '').strip(),
-                        priority=row['priority'].strip().upper(),
-                        uri=row['uri'].strip(),
-                        status=row.get('status', 'IN PROGRESS'),
-                        created_at=row.get('created_at', ''),
-                        finished_at=row.get('finished_at', ''),
+                        id=int(task_id),
+                        owner=owner.strip(),
+                        title=title.strip(),
+                        description=description.strip(),
+                        priority=priority.strip().upper(),
+                        uri=uri.strip(),
+                        status=status,
+                        created_at=created_at,
+                        finished_at=finished_at,
                     )
                     tasks[task.id] = task
         
@@ -128,11 +178,10 @@ def save_csv():
     try:
         with open(file_path, mode='w', newline='', encoding='utf-8') as file:
             if dict_tasks:
-                fieldnames = Task._fields
-                writer = csv.DictWriter(file, fieldnames=fieldnames)
-                writer.writeheader()
-                for task in dict_tasks.values():
-                    writer.writerow(task._asdict())
+                # Task ya es una tupla en el orden de las columnas
+                writer = csv.writer(file)
+                writer.writerow(Task._fields)
+                writer.writerows(dict_tasks.values())
         logging.info(f"Saved {len(dict_tasks)} tasks to CSV")
     except Exception as e:
         logging.error(f"Error saving CSV: {e}")
@@ -147,13 +196,40 @@ def load_history(task_id):
         return []
     
     try:
-        with open(file_path, 'r', encoding='utf-8') as f:
-            data = yaml.safe_load(f) or []
-            return [Entry(**item) for item in data]
+        data = read_json_cache(file_path)
+        if data is None:
+            with open(file_path, 'r', encoding='utf-8') as f:
+                yaml, loader, _ = yaml_codec()
+                data = yaml.load(f, Loader=loader) or []
+            write_json_cache(file_path, data)
+        entries = [Entry(**item) for item in data]
+        _persisted[task_id] = (uri, len(entries), os.path.getsize(file_path))
+        return entries
     except Exception as e:
         logging.error(f"Error loading history: {e}")
         return []
 
+def rename_history(old_uri, new_uri):
+    """Mueve <old_uri>.yaml y su cache JSON a <new_uri>.yaml"""
+    old_path = os.path.join(FOLDER, f"{old_uri}.yaml")
+    new_path = os.path.join(FOLDER, f"{new_uri}.yaml")
+    for suffix in ("", ".json"):
+        try:
+            os.replace(old_path + suffix, new_path + suffix)
+        except FileNotFoundError:
+            pass
+
+def appendable(file_path, size):
+    """True si el YAML no cambió desde la última lectura/escritura y termina en salto de línea"""
+    try:
+        if os.path.getsize(file_path) != size or size == 0:
+            return False
+        with open(file_path, 'rb') as f:
+            f.seek(-1, os.SEEK_END)
+            return f.read(1) == b'\n'
+    except OSError:
+        return False
+
 def save_history(task_id):
     """Guarda historial de una tarea en YAML"""
     if task_id not in dict_tasks:
@@ -164,30 +240,34 @@ def save_history(task_id):
     file_path = os.path.join(FOLDER, f"{uri}.yaml")
     
     try:
-        with open(file_path, 'w', encoding='utf-8') as f:
-            data = [entry._asdict() for entry in history[task_id]]
-            yaml.dump(data, f, allow_unicode=True, sort_keys=False)
+        data = [entry._asdict() for entry in history[task_id]]
+        saved_uri, saved, size = _persisted.get(task_id, (None, 0, 0))
+        if saved_uri and saved_uri != uri:
+            # cambió el dueño: se mueve el historial en lugar de reescribirlo
+            rename_history(saved_uri, uri)
+            saved_uri = uri
+        if saved_uri == uri and 0 < saved <= len(data) and appendable(file_path, size):
+            # el YAML es una lista en bloque: basta agregar las entradas nuevas
+            mode, new_data = 'a', data[saved:]
+        else:
+            mode, new_data = 'w', data
+        if new_data:
+            yaml, _, dumper = yaml_codec()
+            with open(file_path, mode, encoding='utf-8', buffering=YAML_BUFFER) as f:
+                # cada entrada en una sola línea: "- {date: ..., action: ..., activity: ...}"
+                yaml.dump(new_data, f, Dumper=dumper, allow_unicode=True, sort_keys=False,
+                          default_flow_style=None, width=YAML_WIDTH)
+        write_json_cache(file_path, data)
+        _persisted[task_id] = (uri, len(data), os.path.getsize(file_path))
     except Exception as e:
         logging.error(f"Error saving history: {e}")
 
 # Operaciones CRUD
-def add_task():
-    """Agregar nueva tarea"""
+def create_task(owner, title, description, priority="LOW"):
+    """Crea la tarea en memoria; se persiste al salir junto con las demás"""
     global next_id
     
-    owner = input("Enter the owner of the task: ").strip()
-    title = input("Enter the title of the task: ").strip()
-    description = input("Enter the description of the task: ").strip()
-    
-    priority_map = {"1": "LOW", "2": "MEDIUM", "3": "HIGH"}
-    print("\nPriority options:")
-    for key, value in priority_map.items():
-        print(f"  {key} --> {value}")
-    
-    priority_choice = input("Select priority (1-3): ").strip()
-    priority = priority_map.get(priority_choice, "LOW")
-    
-    uri = f"{owner.replace(' ', '_')}_{next_id}"
+    uri = make_uri(owner, next_id)
     task = Task(
         id=next_id,
         owner=owner,
@@ -206,13 +286,61 @@ def add_task():
         action='CREATED',
         activity=f"Task '{title}' created"
     ))
+    _dirty.add(next_id)
+    filter_tasks.cache_clear()
     
-    print(f"\n✓ Task {next_id} added successfully!")
     next_id += 1
+    return task
+
+def bulk_add(records):
+    """Agrega varias tareas sin prompts (dicts con owner, title, description, priority)"""
+    tasks = []
+    for record in records:
+        owner = (record.get('owner') or '').strip()
+        title = (record.get('title') or '').strip()
+        if not owner or not title:
+            logging.warning(f"Skipping record without owner/title: {record}")
+            continue
+        priority = (record.get('priority') or '').strip().upper()
+        tasks.append(create_task(
+            owner=owner,
+            title=title,
+            description=(record.get('description') or '').strip(),
+            priority=priority if priority in PRIORITY_MAP.values() else "LOW",
+        ))
+    logging.info(f"Added {len(tasks)} tasks")
+    return tasks
+
+def import_tasks():
+    """Importa tareas desde un CSV (owner, title, description, priority)"""
+    file_path = input("Enter the path of the CSV to import: ").strip()
+    try:
+        with open(file_path, 'r', encoding='utf-8', newline='', buffering=CSV_BUFFER) as f:
+            tasks = bulk_add(csv.DictReader(f))
+    except OSError as e:
+        logging.error(f"Error importing tasks: {e}")
+        return
+    print(f"\n✓ {len(tasks)} tasks imported successfully!")
+
+def add_task():
+    """Agregar nueva tarea"""
+    owner = input("Enter the owner of the task: ").strip()
+    title = input("Enter the title of the task: ").strip()
+    description = input("Enter the description of the task: ").strip()
+    
+    print("\nPriority options:")
+    for key, value in PRIORITY_MAP.items():
+        print(f"  {key} --> {value}")
+    
+    priority_choice = input("Select priority (1-3): ").strip()
+    priority = PRIORITY_MAP.get(priority_choice, "LOW")
+    
+    task = create_task(owner, title, description, priority)
+    print(f"\n✓ Task {task.id} added successfully!")
 
 def update_task():
     """Actualizar tarea existente"""
-    task_id = int(input("Enter task ID to update: "))
+    task_id = read_id("Enter task ID to update: ")
     task = find_task(task_id)
     if not task:
         return
@@ -222,7 +350,8 @@ def update_task():
     description = input(f"Description [{task.description}]: ").strip() or task.description
     owner = input(f"Owner [{task.owner}]: ").strip() or task.owner
     
-    uri = f"{owner.replace(' ', '_')}_{task_id}"
+    # la uri solo se recalcula si cambia el dueño
+    uri = task.uri if owner == task.owner else make_uri(owner, task_id)
     updated_task = task._replace(
         title=title,
         description=description,
@@ -236,12 +365,14 @@ def update_task():
         action='UPDATED',
         activity=f"Task updated: {title}"
     ))
+    _dirty.add(task_id)
+    filter_tasks.cache_clear()
     
     print(f"\n✓ Task {task_id} updated successfully!")
 
 def add_entry():
     """Agregar entrada al historial de una tarea"""
-    task_id = int(input("Enter task ID for entry: "))
+    task_id = read_id("Enter task ID for entry: ")
     task = find_task(task_id)
     
     if not task:
@@ -254,24 +385,25 @@ def add_entry():
         action='ENTRY',
         activity=activity
     ))
+    _dirty.add(task_id)
     
     print(f"\n✓ Entry added to task {task_id}")
 
 def finalize_task():
     """Finalizar tarea"""
-    task_id = int(input("Enter task ID to finish: "))
+    task_id = read_id("Enter task ID to finish: ")
     task = find_task(task_id)
     
     if not task:
         return
     
-    if task.status in ['SUCCESS', 'FAILED']:
+    if task.status in FINISH_STATUSES:
         print("Task already completed.")
         return
     
     while True:
         status = input("Task completion (SUCCESS/FAILED): ").strip().upper()
-        if status in ['SUCCESS', 'FAILED']:
+        if status in FINISH_STATUSES:
             break
         print("Invalid input. Please enter 'SUCCESS' or 'FAILED'.")
     
@@ -288,46 +420,61 @@ def finalize_task():
         action='COMPLETED',
         activity=f"Task marked as {status}. Comment: {comment}"
     ))
+    _dirty.add(task_id)
+    filter_tasks.cache_clear()
     
     print(f"\n✓ Task {task_id} finished as {status}!")
 
+@lru_cache(maxsize=8)
+def filter_tasks(status_filter):
+    """Tareas por filtro de estado (memoizado hasta que cambian las tareas)"""
+    tasks = dict_tasks.values()
+    match status_filter:
+        case "IN PROGRESS" | "SUCCESS" | "FAILED":
+            return tuple(t for t in tasks if t.status == status_filter)
+        case "DONE":
+            return tuple(t for t in tasks if t.status in FINISH_STATUSES)
+        case _:
+            return tuple(tasks)
+
 @tabulate_print
 def view_tasks():
     """Ver todas las tareas con filtro opcional"""
     print("\nFilter options: ALL, IN PROGRESS, DONE, SUCCESS, FAILED")
     status_filter = input("Enter filter (or press Enter for ALL): ").strip().upper() or "ALL"
     
-    if status_filter == "ALL":
-        return list(dict_tasks.values())
-    elif status_filter == "IN PROGRESS":
-        return [t for t in dict_tasks.values() if t.status == "IN PROGRESS"]
-    elif status_filter == "DONE":
-        return [t for t in dict_tasks.values() if t.status in ("SUCCESS", "FAILED")]
-    elif status_filter == "SUCCESS":
-        return [t for t in dict_tasks.values() if t.status == "SUCCESS"]
-    elif status_filter == "FAILED":
-        return [t for t in dict_tasks.values() if t.status == "FAILED"]
-    else:
+    if status_filter not in VIEW_FILTERS:
         print("Invalid filter. Showing all tasks.")
-        return list(dict_tasks.values())
+        status_filter = "ALL"
+    return filter_tasks(status_filter)
 
 @tabulate_print
 def view_history():
     """Ver historial de una tarea"""
-    task_id = int(input("Enter task ID to view history: "))
+    task_id = read_id("Enter task ID to view history: ")
     if not find_task(task_id):
         return None
     
-    return history[task_id] if history[task_id] else []
+    # get() no inserta listas vacías en el defaultdict
+    entries = history.get(task_id)
+    return list(entries) if entries else []
 
-def exit_app():
-    """Guardar y salir"""
-    print("\nSaving data...")
+def save_pending():
+    """Guarda CSV e historiales solo si hay cambios pendientes"""
+    if not _dirty:
+        return
     save_csv()
     
-    for task_id in history.keys():
-        if history[task_id]:
+    # solo se reescriben los historiales que cambiaron
+    for task_id in _dirty:
+        if history.get(task_id):
             save_history(task_id)
+    _dirty.clear()
+
+def exit_app():
+    """Guardar y salir"""
+    print("\nSaving data...")
+    save_pending()
     
     print("✓ Data saved successfully. Goodbye!")
     sys.exit(0)
@@ -340,6 +487,12 @@ def main():
     # Cargar datos existentes
     os.makedirs(FOLDER, exist_ok=True)
     dict_tasks = load_csv()
+    if dict_tasks is None:
+        # seguir con una sesión vacía haría que el próximo guardado borre el archivo
+        sys.exit(1)
+    filter_tasks.cache_clear()
+    # si el proceso termina sin pasar por exit_app no se pierden cambios
+    atexit.register(save_pending)
     
     # Cargar historiales
     for task_id in dict_tasks.keys():
@@ -355,7 +508,8 @@ def main():
         '4': ('Finalize task', finalize_task),
         '5': ('Add entry', add_entry),
         '6': ('View history', view_history),
-        '7': ('Save and exit', exit_app)
+        '7': ('Import tasks from CSV', import_tasks),
+        '8': ('Save and exit', exit_app)
     }
     
     while True:
@@ -366,7 +520,7 @@ def main():
             print(f"  {key} --> {description}")
         print("="*70)
         
-        action = input("Select action (1-7): ").strip()
+        action = input("Select action (1-8): ").strip()
         
         if action in options:
             try:
@@ -380,7 +534,7 @@ def main():
             except Exception as e:
                 logging.error(f"An error occurred: {e}")
         else:
-            print("Invalid option. Please select 1-7.")
+            print("Invalid option. Please select 1-8.")
 
 if __name__ == "__main__":
     try: